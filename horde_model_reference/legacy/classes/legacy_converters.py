@@ -7,14 +7,16 @@
 
 # If you can avoid it, don't look at this file. It's not pretty.
 
-import glob
 import json
+import os
 import typing
 import urllib.parse
+import warnings
+from collections import Counter, defaultdict
 from pathlib import Path
 
 from loguru import logger
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from typing_extensions import override
 
 from horde_model_reference import (
@@ -44,6 +46,38 @@ from horde_model_reference.path_consts import (
 )
 from horde_model_reference.util import model_name_to_showcase_folder_name
 
+try:
+    from orjson import loads as _json_loads  # type: ignore[import-not-found]
+except ImportError:  # orjson is an optional speedup (the `fast` extra); the stdlib parser accepts `bytes` as well
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+_RecordType = typing.TypeVar("_RecordType", bound=BaseModel)
+
+_SHOWCASE_URL_BASE = f"{GITHUB_REPO_URL.rstrip('/')}/{PACKAGE_NAME}/{DEFAULT_SHOWCASE_FOLDER_NAME}"
+"""The URL of the showcase folder in the live GitHub repo."""
+
+
+_LEGACY_BASELINE_LOOKUP: dict[str, str] = {
+    "stable diffusion 1": "stable_diffusion_1",  # new_record.baseline_trained_resolution = 256
+    "stable diffusion 2": "stable_diffusion_2_768",
+    "stable diffusion 2 512": "stable_diffusion_2_512",
+}
+"""The legacy baseline names which have a different name in the new format. The others are unchanged."""
+
+
+_KNOWN_SLOW_DOWNLOAD_DOMAINS = frozenset({"civitai.com", "civitai.work"})
+"""The (lowercase) download domains which, including their subdomains, are flagged as `known_slow_download`."""
+
+_HUGGINGFACE_HOST = "huggingface.co"
+"""Showcases are expected to be hosted in this repo, not on huggingface."""
+
+
+def _is_known_slow_download_host(hostname: str | None) -> bool:
+    """Return True if `hostname` is, or is a subdomain of, one of the `_KNOWN_SLOW_DOWNLOAD_DOMAINS`."""
+    if not hostname:
+        return False
+    return any(hostname == domain or hostname.endswith("." + domain) for domain in _KNOWN_SLOW_DOWNLOAD_DOMAINS)
+
 
 class BaseLegacyConverter:
     """The logic applicable to all legacy model reference converters.
@@ -66,7 +100,7 @@ class BaseLegacyConverter:
     all_model_records: dict[str, StagingLegacy_Generic_ModelRecord]
     """All the models entries in found that will be converted."""
 
-    all_validation_errors_log: dict[str, list[str]]
+    all_validation_errors_log: defaultdict[str, list[str]]
     """All the validation errors that occurred during the conversion. Written to a log file at the end."""
 
     debug_mode: bool = False
@@ -78,6 +112,12 @@ class BaseLegacyConverter:
     dry_run: bool = False
     """If true, don't write out the converted database or any log files."""
 
+    trusted: bool = False
+    """If true, the legacy records are constructed without pydantic validation. The converted records are instead
+    validated once, just before being written out (see `write_out_records()`).
+
+    Note that with pydantic 2, `model_construct` is no cheaper than validating these records, so this is not faster."""
+
     def __init__(
         self,
         *,
@@ -87,6 +127,7 @@ class BaseLegacyConverter:
         model_reference_category: MODEL_REFERENCE_CATEGORY,
         debug_mode: bool = False,
         dry_run: bool = False,
+        trusted: bool = False,
     ):
         """Initialize an instance of the LegacyConverterBase class.
 
@@ -96,9 +137,10 @@ class BaseLegacyConverter:
             model_reference_category (MODEL_REFERENCE_CATEGORY): The category of model reference to convert.
             debug_mode (bool, optional): If true, include extra information in the error log. Defaults to False.
             dry_run (bool, optional): If true, don't write out the converted database or any logs. Defaults to False.
+            trusted (bool, optional): If true, skip validation of the legacy records. Defaults to False.
         """
         self.all_model_records = {}
-        self.all_validation_errors_log = {}
+        self.all_validation_errors_log = defaultdict(list)
 
         self.model_reference_category = model_reference_category
         self.model_reference_type = MODEL_REFERENCE_LEGACY_TYPE_LOOKUP[model_reference_category]
@@ -118,6 +160,7 @@ class BaseLegacyConverter:
         self.log_folder = Path(log_folder)
 
         self.dry_run = dry_run
+        self.trusted = trusted
 
     def normalize_and_convert(self) -> bool:
         """Normalizes and converts the legacy model reference database to the new format.
@@ -147,15 +190,12 @@ class BaseLegacyConverter:
         self,
         model_record_type: type[StagingLegacy_Generic_ModelRecord],
     ) -> typing.Iterator[tuple[str, StagingLegacy_Generic_ModelRecord]]:
-        raw_legacy_json_data: dict = {}
         """Return an iterator over the legacy model reference database.
 
         Yields:
             Iterator[tuple[str, Legacy_Generic_ModelRecord]]: The model record key and the model record.
         """
-
-        with open(self.legacy_database_path) as legacy_model_reference_file:
-            raw_legacy_json_data = json.load(legacy_model_reference_file)
+        raw_legacy_json_data: dict = _json_loads(self.legacy_database_path.read_bytes())
 
         for model_record_key, model_record_contents in raw_legacy_json_data.items():
             try:
@@ -167,7 +207,7 @@ class BaseLegacyConverter:
                 if "showcases" in model_record_contents["config"]:
                     model_record_contents["showcases"] = model_record_contents["config"]["showcases"]
                     del model_record_contents["config"]["showcases"]
-                record_as_conversion_class = model_record_type.model_validate(model_record_contents)
+                record_as_conversion_class = self._create_record(model_record_type, model_record_contents)
                 self.all_model_records[model_record_key] = record_as_conversion_class
                 yield model_record_key, record_as_conversion_class
             except ValidationError as e:
@@ -175,6 +215,12 @@ class BaseLegacyConverter:
                 self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
                 raise
 
+    def _create_record(self, record_type: type[_RecordType], record_contents: dict) -> _RecordType:
+        """Return `record_contents` as a `record_type`, only validating it if the legacy input isn't trusted."""
+        if self.trusted:
+            return record_type.model_construct(**record_contents)
+        return record_type.model_validate(record_contents)
+
     def config_record_pre_parse(
         self,
         model_record_key: str,
@@ -186,44 +232,45 @@ class BaseLegacyConverter:
             model_record_key (str): The key of the model record.
             model_record_contents (dict): The contents of the model record.
         """
-        parsed_record_config_files_list: list[StagingLegacy_Config_FileRecord] = []
         parsed_record_config_download_list: list[StagingLegacy_Config_DownloadRecord] = []
 
-        if len(model_record_contents["config"]) > 2:
+        legacy_config = model_record_contents["config"]
+        if len(legacy_config) > 2:
             error = f"{model_record_key} has more than 2 config entries."
             self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
 
+        # The files are always handled before the downloads, regardless of their order in the legacy config, as the
+        # sha256sums are shifted from the file records to the download records
         sha_lookup = {}
-        for config_entry in model_record_contents["config"]:
-            if config_entry == "files":
-                for config_file in model_record_contents["config"][config_entry]:
-                    parsed_file_record = StagingLegacy_Config_FileRecord(**config_file)
-                    if ".yaml" in parsed_file_record.path:
-                        continue
-
-                    # We shift the sha256sum to the download record
-                    sha_lookup[parsed_file_record.path] = parsed_file_record.sha256sum
-                    parsed_file_record.sha256sum = None
+        for config_file in legacy_config.get("files", []):
+            if self.trusted:
+                # The file records are discarded, so there is no need to construct them if they aren't validated
+                file_path, file_sha256sum = config_file["path"], config_file.get("sha256sum")
+            else:
+                parsed_file_record = StagingLegacy_Config_FileRecord.model_validate(config_file)
+                file_path, file_sha256sum = parsed_file_record.path, parsed_file_record.sha256sum
+
+            if ".yaml" in file_path:
+                continue
 
-                    parsed_record_config_files_list.append(parsed_file_record)
+            sha_lookup[file_path] = file_sha256sum
 
-            elif config_entry == "download":
-                for download in model_record_contents["config"][config_entry]:
-                    sha_dict = {}
-                    if download.get("file_name") and download["file_name"] in sha_lookup:
-                        sha_dict = {"sha256sum": sha_lookup[download["file_name"]]}
-                    all_params = {**download, **sha_dict}
-                    parsed_download_record = StagingLegacy_Config_DownloadRecord(**all_params)
+        for download in legacy_config.get("download", []):
+            sha_dict = {}
+            if download.get("file_name") and download["file_name"] in sha_lookup:
+                sha_dict = {"sha256sum": sha_lookup[download["file_name"]]}
+            all_params = {**download, **sha_dict}
+            parsed_download_record = self._create_record(StagingLegacy_Config_DownloadRecord, all_params)
 
-                    if parsed_download_record.sha256sum is None:
-                        error = f"{model_record_key} has a download record without a sha256sum."
-                        self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
-                        parsed_download_record.sha256sum = "FIXME"
+            if parsed_download_record.sha256sum is None:
+                error = f"{model_record_key} has a download record without a sha256sum."
+                self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
+                parsed_download_record.sha256sum = "FIXME"
 
-                    if download.get("file_type") and download["file_type"] == "ckpt":
-                        parsed_download_record.file_type = download["file_type"]
+            if download.get("file_type") and download["file_type"] == "ckpt":
+                parsed_download_record.file_type = download["file_type"]
 
-                    parsed_record_config_download_list.append(parsed_download_record)
+            parsed_record_config_download_list.append(parsed_download_record)
 
         return parsed_record_config_download_list
 
@@ -282,20 +329,85 @@ class BaseLegacyConverter:
         for model_record in self.all_model_records.values():
             model_record.purpose = MODEL_PURPOSE_LOOKUP[self.model_reference_category]
 
+    def _validate_trusted_record(self, model_record_key: str, model_record_as_dict: dict) -> dict:
+        """Validate a record which was constructed without validation, as it would have been when it was parsed.
+
+        The validated record replaces the one in `all_model_records`.
+
+        Args:
+            model_record_key (str): The key of the model record.
+            model_record_as_dict (dict): The record as dumped for writing out.
+
+        Raises:
+            ValidationError: Raised if the record is invalid.
+
+        Returns:
+            dict: The validated record, dumped for writing out.
+        """
+        try:
+            validated_record = self.model_reference_type.model_validate(model_record_as_dict)
+        except ValidationError as e:
+            error = f"CRITICAL: Error validating trusted record {model_record_key}:\n{e}"
+            self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
+            raise
+
+        self.all_model_records[model_record_key] = validated_record
+        return validated_record.model_dump(
+            exclude_none=True,
+            exclude_unset=True,
+            by_alias=True,
+        )
+
+    def validate_trusted_records(self, models_in_doc_root: dict[str, dict]) -> None:
+        """Validate the records to be written out against `model_reference_type`, if they are `trusted`.
+
+        The records are first validated in strict mode, so any record which passes is written out unchanged. A record
+        which fails is validated again as it would have been when it was parsed (e.g., `"false"` becomes `False`).
+
+        Args:
+            models_in_doc_root (dict[str, dict]): The records as dumped for writing out. Changed in place.
+
+        Raises:
+            ValidationError: Raised if any of the records are invalid.
+        """
+        if not self.trusted:
+            return
+
+        for model_record_key, model_record_as_dict in models_in_doc_root.items():
+            try:
+                self.model_reference_type.model_validate(model_record_as_dict, strict=True)
+            except ValidationError:
+                models_in_doc_root[model_record_key] = self._validate_trusted_record(
+                    model_record_key,
+                    model_record_as_dict,
+                )
+
     def write_out_records(self) -> None:
-        """Write out the parsed records."""
+        """Write out the parsed records. If the records are `trusted`, they are validated first, even on a dry run."""
+        if self.dry_run and not self.trusted:
+            return
+
+        # Trusted records may hold unvalidated values, which are validated below, so don't warn about them here
+        models_in_doc_root = {
+            k: v.model_dump(
+                exclude_none=True,
+                exclude_unset=True,
+                by_alias=True,
+                warnings=not self.trusted,
+            )
+            for k, v in self.all_model_records.items()
+        }
+        self.validate_trusted_records(models_in_doc_root)
+
         if self.dry_run:
             return
 
+        # `json.dump` writes each encoded chunk to the file separately, so encode the document in one go instead
         with open(self.converted_database_file_path, "w") as new_model_reference_file:
-            json.dump(
-                self.all_model_records,
-                new_model_reference_file,
-                indent=4,
-                default=lambda o: o.model_dump(
-                    exclude_none=True,
-                    exclude_unset=True,
-                    by_alias=True,
+            new_model_reference_file.write(
+                json.dumps(
+                    models_in_doc_root,
+                    indent=4,
                 ),
             )
 
@@ -306,8 +418,6 @@ class BaseLegacyConverter:
         error: str,
     ) -> None:
         """Add a validation error to the log."""
-        if model_record_key not in self.all_validation_errors_log:
-            self.all_validation_errors_log[model_record_key] = []
         self.all_validation_errors_log[model_record_key].append(error)
 
         if self.debug_mode:
@@ -329,21 +439,23 @@ class BaseLegacyConverter:
 
 
 class LegacyStableDiffusionConverter(BaseLegacyConverter):
-    showcase_glob_pattern: str = "horde_model_reference/showcase/*"
-    """The glob pattern used to find all showcase folders. Defaults to `'horde_model_reference/showcase/*'`."""
+    showcase_folder_path: Path = Path(PACKAGE_NAME, DEFAULT_SHOWCASE_FOLDER_NAME)
+    """The folder containing all showcase folders. Defaults to `'horde_model_reference/showcase'`."""
     # todo: extract to consts
 
-    all_baseline_categories: dict[str, int]
-    """A dictionary of all the baseline types found and the number of times they appear."""
-    all_styles: dict[str, int]
-    """A dictionary of all the styles found and the number of times they appear."""
-    all_tags: dict[str, int]
-    """A dictionary of all the tags found and the number of times they appear."""
-    all_download_hosts: dict[str, int]
-    """A dictionary of all the model hosts found and the number of times they appear."""
+    all_baseline_categories: Counter[str]
+    """A counter of all the baseline types found and the number of times they appear."""
+    all_styles: Counter[str]
+    """A counter of all the styles found and the number of times they appear."""
+    all_tags: Counter[str]
+    """A counter of all the tags found and the number of times they appear."""
+    all_download_hosts: Counter[str]
+    """A counter of all the model hosts found and the number of times they appear."""
 
     existing_showcase_files: dict[str, list[str]]
-    """The pre-existing showcase files found in the target folder."""
+    """The URL quoted names of the pre-existing showcase files found in the target folder."""
+    expected_showcase_folder_names: set[str]
+    """The showcase folder names of all the model records parsed so far."""
 
     def __init__(
         self,
@@ -351,6 +463,7 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
         legacy_folder_path: str | Path = LEGACY_REFERENCE_FOLDER,
         target_file_folder: str | Path = BASE_PATH,
         debug_mode: bool = False,
+        trusted: bool = False,
     ):
         """Initialize an instance of the LegacyStableDiffusionConverter class.
 
@@ -358,22 +471,34 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
             legacy_folder_path (str | Path, optional): The legacy database folder. Defaults to LEGACY_REFERENCE_FOLDER.
             target_file_folder (str | Path): The folder to write the converted database to.
             debug_mode (bool, optional): If true, include extra information in the error log. Defaults to False.
+            trusted (bool, optional): If true, skip validation of the legacy records. Defaults to False.
         """
         super().__init__(
             legacy_folder_path=legacy_folder_path,
             target_file_folder=target_file_folder,
             model_reference_category=path_consts.MODEL_REFERENCE_CATEGORY.stable_diffusion,
             debug_mode=debug_mode,
+            trusted=trusted,
+        )
+        self.all_baseline_categories = Counter()
+        self.all_styles = Counter()
+        self.all_tags = Counter()
+        self.all_download_hosts = Counter()
+        self.expected_showcase_folder_names = set()
+
+    @property
+    def showcase_glob_pattern(self) -> str:
+        """Deprecated: the glob pattern matching all showcase folders. Use `showcase_folder_path` instead."""
+        warnings.warn(
+            "showcase_glob_pattern is deprecated, use `showcase_folder_path` instead.",
+            DeprecationWarning,
+            stacklevel=2,
         )
-        self.all_baseline_categories = {}
-        self.all_styles = {}
-        self.all_tags = {}
-        self.all_download_hosts = {}
+        return self.showcase_folder_path.joinpath("*").as_posix()
 
     @override
     def pre_parse_records(self) -> None:
-        existing_showcase_folders = glob.glob(self.showcase_glob_pattern, recursive=True)
-        self.existing_showcase_files = self.get_existing_showcases(existing_showcase_folders)
+        self.existing_showcase_files = self.get_existing_showcases(self.showcase_folder_path)
 
     @override
     def parse_record(
@@ -384,9 +509,7 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
         if not isinstance(model_record_in_progress, Legacy_StableDiffusion_ModelRecord):
             raise TypeError(f"Expected {model_record_key} to be a Stable Diffusion record.")
         if model_record_in_progress.style is not None:
-            self.all_styles[model_record_in_progress.style] = (
-                self.all_styles.get(model_record_in_progress.style, 0) + 1
-            )
+            self.all_styles[model_record_in_progress.style] += 1
 
         if model_record_in_progress.type != "ckpt":
             error = f"{model_record_key} is not a ckpt!"
@@ -396,31 +519,27 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
         # Increment baseline category counter
         #
         model_record_in_progress.baseline = self.convert_legacy_baseline(model_record_in_progress.baseline)
-        self.all_baseline_categories[model_record_in_progress.baseline] = (
-            self.all_baseline_categories.get(model_record_in_progress.baseline, 0) + 1
-        )
+        self.all_baseline_categories[model_record_in_progress.baseline] += 1
 
         #
         # Showcase handling and sanity checks
         #
         expected_showcase_foldername = model_name_to_showcase_folder_name(model_record_key)
-        self.create_showcase_folder(expected_showcase_foldername)
+        self.expected_showcase_folder_names.add(expected_showcase_foldername)
 
         if model_record_in_progress.showcases is not None and len(model_record_in_progress.showcases) > 0:
-            if any("huggingface" in showcase for showcase in model_record_in_progress.showcases):
+            if any(_HUGGINGFACE_HOST in showcase for showcase in model_record_in_progress.showcases):
                 error = f"{model_record_key} has a huggingface showcase."
                 self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
 
-            if expected_showcase_foldername not in self.existing_showcase_files:
-                raise RuntimeError
+            # A missing showcase folder is reported the same as an empty one
+            model_showcase_files = self.existing_showcase_files.get(expected_showcase_foldername, [])
 
-            if len(self.existing_showcase_files[expected_showcase_foldername]) == 0:
+            if len(model_showcase_files) == 0:
                 error = f"{model_record_key} has no showcases defined on disk."
                 self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
 
-            if len(model_record_in_progress.showcases) != len(
-                self.existing_showcase_files[expected_showcase_foldername],
-            ):
+            if len(model_record_in_progress.showcases) != len(model_showcase_files):
                 error = (
                     f"{model_record_key} has no showcase folder when it was expected to have one. "
                     "Expected: {expected_showcase_foldername}"
@@ -428,23 +547,18 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
                 self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
 
             model_record_in_progress.showcases = []
-            for file in self.existing_showcase_files[expected_showcase_foldername]:
-                url_friendly_name = urllib.parse.quote(Path(file).name)
+            for url_friendly_name in model_showcase_files:
                 # if not any(url_friendly_name in showcase for showcase in new_record.showcases):
                 #     logger.debug(f"{model_record_key} is missing a showcase for {url_friendly_name}.")
                 #     logger.debug(f"{new_record.showcases=}")
                 #     continue
-                expected_github_location = urllib.parse.urljoin(
-                    GITHUB_REPO_URL,
-                    f"{PACKAGE_NAME}/{DEFAULT_SHOWCASE_FOLDER_NAME}/{expected_showcase_foldername}/{url_friendly_name}",
-                )
+                expected_github_location = f"{_SHOWCASE_URL_BASE}/{expected_showcase_foldername}/{url_friendly_name}"
                 model_record_in_progress.showcases.append(expected_github_location)
         #
         # Increment tag counter
         #
         if model_record_in_progress.tags is not None:
-            for tag in model_record_in_progress.tags:
-                self.all_tags[tag] = self.all_tags.get(tag, 0) + 1
+            self.all_tags.update(model_record_in_progress.tags)
 
         #
         # Config handling and sanity checks
@@ -462,32 +576,30 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
         #
         # Increment host counter
         #
-        for found_host in found_hosts:
-            self.all_download_hosts[found_host] = self.all_download_hosts.get(found_host, 0) + 1
+        self.all_download_hosts.update(found_hosts.keys())
 
     @override
     def post_parse_records(self) -> None:
         super().post_parse_records()
-        final_on_disk_showcase_folders = glob.glob(self.showcase_glob_pattern, recursive=True)
-        for folder in final_on_disk_showcase_folders:
-            parsed_folder = Path(folder)
-
-            if parsed_folder.is_file():
-                continue
+        self.create_showcase_folders(self.expected_showcase_folder_names)
+
+        final_on_disk_showcase_folders_names: list[str] = []
+        if self.showcase_folder_path.is_dir():
+            with os.scandir(self.showcase_folder_path) as showcase_folder_entries:
+                for showcase_folder_entry in showcase_folder_entries:
+                    # Hidden entries are skipped, as in `get_existing_showcases`
+                    if showcase_folder_entry.name.startswith(".") or not showcase_folder_entry.is_dir():
+                        continue
 
-            if not any(parsed_folder.iterdir()):
-                error = f"showcase folder '{parsed_folder.name}' is empty."
-                self.add_validation_error_to_log(model_record_key=parsed_folder.name, error=error)
+                    final_on_disk_showcase_folders_names.append(showcase_folder_entry.name)
 
-        final_on_disk_showcase_folders_names = [
-            Path(folder).name for folder in final_on_disk_showcase_folders if Path(folder).is_dir()
-        ]
-        final_expected_showcase_folders = [
-            model_name_to_showcase_folder_name(model_name) for model_name in self.all_model_records
-        ]
+                    with os.scandir(showcase_folder_entry.path) as showcase_files:
+                        if next(showcase_files, None) is None:
+                            error = f"showcase folder '{showcase_folder_entry.name}' is empty."
+                            self.add_validation_error_to_log(model_record_key=showcase_folder_entry.name, error=error)
 
         for folder in final_on_disk_showcase_folders_names:
-            if folder not in final_expected_showcase_folders:
+            if folder not in self.expected_showcase_folder_names:
                 error = f"folder '{folder}' is not in the model records."
                 self.add_validation_error_to_log(model_record_key=folder, error=error)
 
@@ -523,6 +635,7 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
                 exclude_none=True,
                 exclude_unset=True,
                 by_alias=True,
+                warnings=not self.trusted,
             )
             for k, v in self.all_model_records.items()
         }
@@ -530,10 +643,26 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
         try:
             # If this fails, we have a problem. By definition, the model reference should be converted by this point
             # and ready to be cast to the new model reference type.
-            for model_entry in sanity_check.values():
-                model_entry_as_dict = model_entry.model_dump(by_alias=True)
+            for model_record_key, model_entry in sanity_check.items():
+                model_entry_as_dict = model_entry.model_dump(by_alias=True, warnings=not self.trusted)
                 model_entry_as_dict["purpose"] = MODEL_PURPOSE.image_generation
-                StableDiffusion_ModelRecord(**model_entry_as_dict)
+                if not self.trusted:
+                    StableDiffusion_ModelRecord.model_validate(model_entry_as_dict)
+                    continue
+
+                # This is the only validation trusted records get. It is strict, so a record which passes is written
+                # out unchanged. Any other record is validated as it would have been when it was parsed, then checked
+                # again.
+                try:
+                    StableDiffusion_ModelRecord.model_validate(model_entry_as_dict, strict=True)
+                except ValidationError:
+                    models_in_doc_root[model_record_key] = self._validate_trusted_record(
+                        model_record_key,
+                        models_in_doc_root[model_record_key],
+                    )
+                    model_entry_as_dict = self.all_model_records[model_record_key].model_dump(by_alias=True)
+                    model_entry_as_dict["purpose"] = MODEL_PURPOSE.image_generation
+                    StableDiffusion_ModelRecord.model_validate(model_entry_as_dict)
         except ValidationError as e:
             logger.exception(e)
             logger.exception("CRITICAL: Failed to convert to new model reference type.")
@@ -555,60 +684,77 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
 
     def get_existing_showcases(
         self,
-        existing_showcase_folders: list[str],
+        showcase_root: Path,
     ) -> dict[str, list[str]]:
-        """Return a dictionary of existing showcase files, keyed by the showcase folder name.
+        """Return a dictionary of the URL quoted names of existing showcase files, keyed by the showcase folder name.
+
+        Hidden files and folders (starting with a `.`) are ignored.
 
         Args:
-            existing_showcase_folders (list[str]): The list of existing showcase folders.
+            showcase_root (Path): The folder containing the showcase folders.
 
         Returns:
-            dict[str, list[str]]: A dictionary of existing showcase files, keyed by the showcase folder name.
+            dict[str, list[str]]: A dictionary of existing showcase file names, keyed by the showcase folder name.
         """
         existing_showcase_files: dict[str, list[str]] = {}
-        for showcase_folder in existing_showcase_folders:
-            model_showcase_files = glob.glob(str(Path(showcase_folder).joinpath("*")), recursive=True)
-            model_showcase_folder_name = model_name_to_showcase_folder_name(Path(showcase_folder).name)
+        if not showcase_root.is_dir():
+            return existing_showcase_files
+
+        with os.scandir(showcase_root) as showcase_folder_entries:
+            for showcase_folder_entry in showcase_folder_entries:
+                if showcase_folder_entry.name.startswith(".") or not showcase_folder_entry.is_dir():
+                    continue
 
-            existing_showcase_files[model_showcase_folder_name] = model_showcase_files
+                with os.scandir(showcase_folder_entry.path) as showcase_file_entries:
+                    model_showcase_files = [
+                        urllib.parse.quote(showcase_file_entry.name)
+                        for showcase_file_entry in showcase_file_entries
+                        if not showcase_file_entry.name.startswith(".")
+                    ]
+                model_showcase_folder_name = model_name_to_showcase_folder_name(showcase_folder_entry.name)
+
+                existing_showcase_files[model_showcase_folder_name] = model_showcase_files
 
         return existing_showcase_files
 
-    def convert_legacy_baseline(self, baseline: str):
+    @staticmethod
+    def convert_legacy_baseline(baseline: str) -> str:
         """Returns the new standardized baseline name for the given legacy baseline name."""
-        if baseline == "stable diffusion 1":
-            baseline = "stable_diffusion_1"
-            # new_record.baseline_trained_resolution = 256
-        elif baseline == "stable diffusion 2":
-            baseline = "stable_diffusion_2_768"
-        elif baseline == "stable diffusion 2 512":
-            baseline = "stable_diffusion_2_512"
-        elif baseline == "stable_diffusion_xl":
-            baseline = "stable_diffusion_xl"
-        elif baseline == "stable_cascade":
-            baseline = "stable_cascade"
-        return baseline
+        return _LEGACY_BASELINE_LOOKUP.get(baseline, baseline)
+
+    def create_showcase_folders(self, showcase_foldernames: typing.Iterable[str]) -> None:
+        """Create the showcase folders with the given names, if they don't already exist.
+
+        Args:
+            showcase_foldernames (Iterable[str]): The names of the showcase folders to create.
+        """
+        showcase_root = self.converted_folder_path.joinpath(path_consts.DEFAULT_SHOWCASE_FOLDER_NAME)
+        showcase_root.mkdir(parents=True, exist_ok=True)
+
+        for showcase_foldername in showcase_foldernames:
+            showcase_root.joinpath(showcase_foldername).mkdir(exist_ok=True)
 
     def create_showcase_folder(self, showcase_foldername: str) -> None:
-        """Create a showcase folder with the given name.
+        """Deprecated: create a single showcase folder. Use `create_showcase_folders()` instead.
 
         Args:
             showcase_foldername (str): The name of the showcase folder to create.
         """
-
+        warnings.warn(
+            "create_showcase_folder() is deprecated, use `create_showcase_folders()` instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.create_showcase_folders([showcase_foldername])
         if showcase_foldername not in self.existing_showcase_files:
             self.existing_showcase_files[showcase_foldername] = []
 
-        newFolder = self.converted_folder_path.joinpath(path_consts.DEFAULT_SHOWCASE_FOLDER_NAME)
-        newFolder = newFolder.joinpath(showcase_foldername)
-        newFolder.mkdir(parents=True, exist_ok=True)
-
     def normalize_and_convert_config_entries(
         self,
         *,
         model_record_key: str,
         config_entries: dict[str, list[StagingLegacy_Config_FileRecord | StagingLegacy_Config_DownloadRecord]],
-    ) -> dict[str, int]:
+    ) -> Counter[str]:
         """Normalize and convert the config entries. This changes the contents of param `config_entries`.
 
         Args:
@@ -619,9 +765,9 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
             TypeError: Raised if a config file definition is under the wrong key.
 
         Returns:
-            dict[str, int]: A dict of the hosts and the number of files they host for this model.
+            Counter[str]: A counter of the hosts and the number of files they host for this model.
         """
-        download_hosts: dict[str, int] = {}
+        download_hosts: Counter[str] = Counter()
         for config_entry_key, config_entry_object in config_entries.items():
             if config_entry_key == "files":
                 for config_file in config_entry_object:
@@ -670,17 +816,18 @@ class LegacyStableDiffusionConverter(BaseLegacyConverter):
                         self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
                         continue
 
-                    if "civitai" in download.file_url:
-                        download.known_slow_download = True
-
                     try:
-                        host = urllib.parse.urlparse(download.file_url).netloc
-                        download_hosts[host] = download_hosts.get(host, 0) + 1
+                        parsed_file_url = urllib.parse.urlparse(download.file_url)
+                        download_hosts[parsed_file_url.netloc] += 1
                     except Exception:
                         error = f"{model_record_key} has a download with an invalid file_url."
                         self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
                         raise
 
+                    # `hostname` is lowercase and has no port or userinfo, unlike `netloc`
+                    if _is_known_slow_download_host(parsed_file_url.hostname):
+                        download.known_slow_download = True
+
         return download_hosts
 
 
@@ -691,12 +838,14 @@ class LegacyClipConverter(BaseLegacyConverter):
         legacy_folder_path: str | Path = LEGACY_REFERENCE_FOLDER,
         target_file_folder: str | Path = BASE_PATH,
         debug_mode: bool = False,
+        trusted: bool = False,
     ):
         super().__init__(
             legacy_folder_path=legacy_folder_path,
             target_file_folder=target_file_folder,
             model_reference_category=MODEL_REFERENCE_CATEGORY.clip,
             debug_mode=debug_mode,
+            trusted=trusted,
         )
 
     @override
@@ -706,22 +855,19 @@ class LegacyClipConverter(BaseLegacyConverter):
         model_record_contents: dict,
     ) -> list[StagingLegacy_Config_DownloadRecord]:
         new_record_config_download_list: list[StagingLegacy_Config_DownloadRecord] = []
-        if len(model_record_contents["config"]) > 2:
+        legacy_config = model_record_contents["config"]
+        if len(legacy_config) > 2:
             error = f"{model_record_key} has more than 2 config entries."
             self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
-        for config_entry in model_record_contents["config"]:
-            if config_entry == "files":
+        for download in legacy_config.get("download", []):
+            # Skip if file_url is missing
+            if download.get("file_url") is None or download.get("file_url") == "":
                 continue
-            if config_entry == "download":
-                for download in model_record_contents["config"][config_entry]:
-                    # Skip if file_url is missing
-                    if download.get("file_url") is None or download.get("file_url") == "":
-                        continue
-                    parsed_download_record = StagingLegacy_Config_DownloadRecord(**download)
-                    parsed_download_record.file_name = model_record_key.replace("/", "-") + ".pt"
-                    parsed_download_record.sha256sum = "FIXME"
-                    error = f"{model_record_key} has no sha256sum."
-                    self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
-                    new_record_config_download_list.append(parsed_download_record)
+            parsed_download_record = self._create_record(StagingLegacy_Config_DownloadRecord, download)
+            parsed_download_record.file_name = model_record_key.replace("/", "-") + ".pt"
+            parsed_download_record.sha256sum = "FIXME"
+            error = f"{model_record_key} has no sha256sum."
+            self.add_validation_error_to_log(model_record_key=model_record_key, error=error)
+            new_record_config_download_list.append(parsed_download_record)
 
         return new_record_config_download_list
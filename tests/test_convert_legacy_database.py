@@ -3,6 +3,7 @@ import urllib.parse
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
 import horde_model_reference.path_consts as path_consts
 from horde_model_reference.legacy.classes.legacy_converters import (
@@ -12,6 +13,7 @@ from horde_model_reference.legacy.classes.legacy_converters import (
 )
 from horde_model_reference.legacy.classes.staging_model_database_records import (
     MODEL_REFERENCE_LEGACY_TYPE_LOOKUP,
+    StagingLegacy_Config_DownloadRecord,
     StagingLegacy_Generic_ModelRecord,
 )
 from horde_model_reference.model_reference_records import StableDiffusion_ModelRecord, StableDiffusion_ModelReference
@@ -25,6 +27,143 @@ def test_convert_legacy_stable_diffusion_database(base_path_for_tests: Path, leg
     assert sd_converter.normalize_and_convert()
 
 
+def test_convert_legacy_stable_diffusion_database_trusted(base_path_for_tests: Path, legacy_folder_for_tests: Path):
+    """Constructing the records without validation gives the same result as validating them."""
+    validated_sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=legacy_folder_for_tests,
+        target_file_folder=base_path_for_tests,
+    )
+    assert validated_sd_converter.normalize_and_convert()
+
+    trusted_sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=legacy_folder_for_tests,
+        target_file_folder=base_path_for_tests,
+        trusted=True,
+    )
+    assert trusted_sd_converter.normalize_and_convert()
+
+    assert {k: v.model_dump() for k, v in trusted_sd_converter.all_model_records.items()} == {
+        k: v.model_dump() for k, v in validated_sd_converter.all_model_records.items()
+    }
+
+
+def _write_legacy_database(
+    legacy_folder: Path,
+    model_reference_category: path_consts.MODEL_REFERENCE_CATEGORY,
+    legacy_records: dict,
+) -> None:
+    legacy_folder.mkdir(parents=True, exist_ok=True)
+    legacy_database_path = path_consts.get_model_reference_file_path(model_reference_category, base_path=legacy_folder)
+    legacy_database_path.write_text(json.dumps(legacy_records))
+
+
+def _example_legacy_esrgan_record(**overrides) -> dict:
+    return {
+        "name": "example",
+        "type": "esrgan",
+        "config": {
+            "files": [{"path": "example.pth", "sha256sum": "DEADBEEF" * 8}],
+            "download": [{"file_name": "example.pth", "file_url": "https://www.some_website.com/example.pth"}],
+        },
+        **overrides,
+    }
+
+
+def _example_legacy_stable_diffusion_record(**overrides) -> dict:
+    return {
+        "name": "example",
+        "baseline": "stable diffusion 1",
+        "type": "ckpt",
+        "inpainting": False,
+        "description": "An example model.",
+        "version": "1",
+        "style": "generalist",
+        "nsfw": False,
+        "download_all": False,
+        "config": {
+            "files": [{"path": "example.ckpt", "sha256sum": "DEADBEEF" * 8}, {"path": "v1-inference.yaml"}],
+            "download": [
+                {"file_name": "example.ckpt", "file_path": "", "file_url": "https://www.some_website.com/x.ckpt"},
+            ],
+        },
+        **overrides,
+    }
+
+
+def test_convert_invalid_trusted_legacy_database(tmp_path: Path):
+    """An invalid field is rejected whether or not the legacy records are constructed without validation."""
+    _write_legacy_database(
+        tmp_path.joinpath("legacy"),
+        path_consts.MODEL_REFERENCE_CATEGORY.esrgan,
+        {"example": _example_legacy_esrgan_record(nsfw="definitely")},
+    )
+
+    for trusted in (False, True):
+        base_converter = BaseLegacyConverter(
+            legacy_folder_path=tmp_path.joinpath("legacy"),
+            target_file_folder=tmp_path,
+            model_reference_category=path_consts.MODEL_REFERENCE_CATEGORY.esrgan,
+            dry_run=True,
+            trusted=trusted,
+        )
+        with pytest.raises(ValidationError) as validation_error:
+            base_converter.normalize_and_convert()
+
+        assert [error["loc"][-1] for error in validation_error.value.errors()] == ["nsfw"]
+
+
+def test_convert_coerced_trusted_legacy_database(tmp_path: Path):
+    """A value which is only valid after coercion is written out the same whether or not the input is trusted."""
+    _write_legacy_database(
+        tmp_path.joinpath("legacy"),
+        path_consts.MODEL_REFERENCE_CATEGORY.esrgan,
+        {"example": _example_legacy_esrgan_record(nsfw="false")},
+    )
+
+    converted_databases = {}
+    for trusted in (False, True):
+        target_file_folder = tmp_path.joinpath(f"trusted_{trusted}")
+        target_file_folder.mkdir()
+        base_converter = BaseLegacyConverter(
+            legacy_folder_path=tmp_path.joinpath("legacy"),
+            target_file_folder=target_file_folder,
+            model_reference_category=path_consts.MODEL_REFERENCE_CATEGORY.esrgan,
+            trusted=trusted,
+        )
+        assert base_converter.normalize_and_convert()
+        converted_databases[trusted] = base_converter.converted_database_file_path.read_text()
+
+    assert converted_databases[True] == converted_databases[False]
+    assert json.loads(converted_databases[True])["example"]["nsfw"] is False
+
+
+def test_convert_coerced_trusted_legacy_stable_diffusion_database(tmp_path: Path):
+    """As above, but for the stable diffusion converter, which validates trusted records against the new format."""
+    _write_legacy_database(
+        tmp_path.joinpath("legacy"),
+        path_consts.MODEL_REFERENCE_CATEGORY.stable_diffusion,
+        {
+            "example": _example_legacy_stable_diffusion_record(nsfw="false"),
+            "valid example": _example_legacy_stable_diffusion_record(name="valid example"),
+        },
+    )
+
+    converted_databases = {}
+    for trusted in (False, True):
+        target_file_folder = tmp_path.joinpath(f"trusted_{trusted}")
+        target_file_folder.mkdir()
+        sd_converter = LegacyStableDiffusionConverter(
+            legacy_folder_path=tmp_path.joinpath("legacy"),
+            target_file_folder=target_file_folder,
+            trusted=trusted,
+        )
+        assert sd_converter.normalize_and_convert()
+        converted_databases[trusted] = sd_converter.converted_database_file_path.read_text()
+
+    assert converted_databases[True] == converted_databases[False]
+    assert json.loads(converted_databases[True])["example"]["nsfw"] is False
+
+
 def test_convert_legacy_clip_database(base_path_for_tests: Path, legacy_folder_for_tests: Path):
     clip_converter = LegacyClipConverter(
         legacy_folder_path=legacy_folder_for_tests,
@@ -120,3 +259,152 @@ def test_validate_converted_stable_diffusion_database(base_path_for_tests) -> No
         assert model_reference.get_model_baseline(model_key) is not None
         assert model_reference.get_model_style(model_key) is not None
         assert isinstance(model_reference.get_model_tags(model_key), list)
+
+
+def test_config_record_pre_parse_files_after_download(base_path_for_tests: Path, legacy_folder_for_tests: Path):
+    """The sha256sum of a file record is moved to its download record even if `download` comes first."""
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=legacy_folder_for_tests,
+        target_file_folder=base_path_for_tests,
+    )
+    model_record_contents = {
+        "config": {
+            "download": [
+                {
+                    "file_name": "example.ckpt",
+                    "file_path": "",
+                    "file_url": "https://www.some_website.com/example.ckpt",
+                },
+            ],
+            "files": [
+                {"path": "example.ckpt", "sha256sum": "DEADBEEF" * 8},
+                {"path": "v1-inference.yaml"},
+            ],
+        },
+    }
+
+    download_records = sd_converter.config_record_pre_parse("example", model_record_contents)
+
+    assert len(download_records) == 1
+    assert download_records[0].sha256sum == "DEADBEEF" * 8
+    assert "example" not in sd_converter.all_validation_errors_log
+
+
+@pytest.mark.parametrize(
+    ("file_url", "known_slow_download"),
+    [
+        ("https://civitai.com/api/download/models/1", True),
+        ("https://civitai.com:443/api/download/models/1", True),
+        ("https://user@CivitAI.com/api/download/models/1", True),
+        ("https://api.civitai.com/download/3", True),
+        ("https://notcivitai.com/download/3", False),
+        ("https://huggingface.co/civitai/example/resolve/main/example.ckpt", False),
+        ("https://www.some_website.com/example.ckpt", False),
+    ],
+)
+def test_known_slow_download_hosts(
+    base_path_for_tests: Path,
+    legacy_folder_for_tests: Path,
+    file_url: str,
+    known_slow_download: bool,
+):
+    """Downloads are flagged as slow based on the host of their URL, not on the URL containing 'civitai'."""
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=legacy_folder_for_tests,
+        target_file_folder=base_path_for_tests,
+    )
+    download_record = StagingLegacy_Config_DownloadRecord(file_name="example.ckpt", file_url=file_url)
+
+    found_hosts = sd_converter.normalize_and_convert_config_entries(
+        model_record_key="example",
+        config_entries={"download": [download_record]},
+    )
+
+    assert download_record.known_slow_download is known_slow_download
+    assert sum(found_hosts.values()) == 1
+
+
+def test_get_existing_showcases(tmp_path: Path, base_path_for_tests: Path, legacy_folder_for_tests: Path):
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=legacy_folder_for_tests,
+        target_file_folder=base_path_for_tests,
+    )
+    showcase_root = tmp_path.joinpath("showcase")
+    showcase_root.joinpath("Example Model").mkdir(parents=True)
+    showcase_root.joinpath("Example Model", "example image.png").write_bytes(b"")
+    showcase_root.joinpath("Example Model", ".hidden.png").write_bytes(b"")
+    showcase_root.joinpath("empty_model").mkdir()
+    showcase_root.joinpath(".hidden_folder").mkdir()
+    showcase_root.joinpath("README.md").write_text("")
+
+    existing_showcases = sd_converter.get_existing_showcases(showcase_root)
+
+    assert existing_showcases == {
+        "example_model": ["example%20image.png"],
+        "empty_model": [],
+    }
+    assert sd_converter.get_existing_showcases(tmp_path.joinpath("missing")) == {}
+
+
+def test_post_parse_records_reports_showcase_folders(tmp_path: Path):
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=tmp_path.joinpath("legacy"),
+        target_file_folder=tmp_path,
+    )
+    sd_converter.showcase_folder_path = tmp_path.joinpath("showcase")
+    sd_converter.showcase_folder_path.joinpath("example").mkdir(parents=True)
+    sd_converter.showcase_folder_path.joinpath("example", "image.png").write_bytes(b"")
+    sd_converter.showcase_folder_path.joinpath("empty_model").mkdir()
+    sd_converter.showcase_folder_path.joinpath("orphan").mkdir()
+    sd_converter.showcase_folder_path.joinpath("orphan", "image.png").write_bytes(b"")
+    sd_converter.showcase_folder_path.joinpath(".hidden_folder").mkdir()
+    sd_converter.showcase_folder_path.joinpath("README.md").write_text("")
+    sd_converter.expected_showcase_folder_names = {"example", "empty_model"}
+
+    sd_converter.post_parse_records()
+
+    assert dict(sd_converter.all_validation_errors_log) == {
+        "empty_model": ["showcase folder 'empty_model' is empty."],
+        "orphan": ["folder 'orphan' is not in the model records."],
+    }
+
+
+def test_convert_legacy_stable_diffusion_database_missing_showcase_folder(tmp_path: Path):
+    """A record whose showcase folder is missing on disk is logged, rather than aborting the conversion."""
+    _write_legacy_database(
+        tmp_path.joinpath("legacy"),
+        path_consts.MODEL_REFERENCE_CATEGORY.stable_diffusion,
+        {"example": _example_legacy_stable_diffusion_record(showcases=["https://www.some_website.com/x.png"])},
+    )
+
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=tmp_path.joinpath("legacy"),
+        target_file_folder=tmp_path,
+    )
+    sd_converter.showcase_folder_path = tmp_path.joinpath("showcase")
+    assert sd_converter.normalize_and_convert()
+
+    assert "example has no showcases defined on disk." in sd_converter.all_validation_errors_log["example"]
+    assert sd_converter.all_model_records["example"].showcases == []
+
+
+def test_showcase_glob_pattern_is_deprecated(tmp_path: Path):
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=tmp_path.joinpath("legacy"),
+        target_file_folder=tmp_path,
+    )
+    with pytest.deprecated_call():
+        assert sd_converter.showcase_glob_pattern == "horde_model_reference/showcase/*"
+
+
+def test_create_showcase_folder_is_deprecated(tmp_path: Path):
+    sd_converter = LegacyStableDiffusionConverter(
+        legacy_folder_path=tmp_path.joinpath("legacy"),
+        target_file_folder=tmp_path,
+    )
+    sd_converter.existing_showcase_files = {}
+    with pytest.deprecated_call():
+        sd_converter.create_showcase_folder("example")
+
+    assert tmp_path.joinpath(path_consts.DEFAULT_SHOWCASE_FOLDER_NAME, "example").is_dir()
+    assert sd_converter.existing_showcase_files == {"example": []}